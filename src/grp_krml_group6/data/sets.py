@@ -1,3 +1,43 @@
+import functools
+import os
+import re
+import stat
+import struct
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import roc_curve, auc
+
+_sns = None
+_plt = None
+
+def _load_plotting():
+    """Import seaborn and matplotlib on first use and cache the modules
+
+    Returns
+    -------
+    module
+        seaborn
+    module
+        matplotlib.pyplot
+    """
+    global _sns, _plt
+
+    if _plt is None:
+        try:
+            import seaborn as sns
+            import matplotlib.pyplot as plt
+        except ImportError as e:
+            raise ImportError("Plotting functions require seaborn and matplotlib to be installed") from e
+        _sns, _plt = sns, plt
+
+    return _sns, _plt
+
 def pop_target(df, target_col):
     """
     Extract target variable from the dataframe
@@ -15,12 +55,88 @@ def pop_target(df, target_col):
         subsetted pandas dataframe containing all features
     pd.Dataframe
         subsetted pandas dataframe containing target
+
+    Notes
+    -----
+    The input dataframe is left untouched and writing to the returned features
+    or target never modifies it.
+
+    Memory is only saved when pandas copy-on-write is enabled
+    (`pd.set_option("mode.copy_on_write", True)`): the target is then returned
+    without a copy and `drop` defers copying feature columns stored in separate
+    blocks until one of the frames is written to. Without copy-on-write, the
+    pandas default before 3.0, `drop` copies every feature column and the target
+    has to be copied as well, so peak memory is the same as copying the whole
+    dataframe.
+    """
+    features = df.drop(columns=[target_col])
+    target = df[target_col] if pd.options.mode.copy_on_write else df[target_col].copy()
+    return features, target
+
+def _replace_file(path, write):
+    """Write a file through a temporary file in the same folder, then move it onto `path`
+
+    The target is never truncated in place, so arrays memory-mapped from it stay
+    valid while the new content is written, and the file is replaced atomically.
+    The new file keeps the permissions of the file it replaces, or gets the
+    default permissions allowed by the umask like a file created with `open`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to write
+    write : callable
+        Function writing the content to the open binary file it receives
+    """
+    # Created with os.open rather than tempfile.mkstemp, which forces mode 0600
+    tmp_path = os.path.join(os.path.dirname(path), f'.{os.path.basename(path)}.{uuid.uuid4().hex}.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        if os.path.exists(path):
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def numpy_save_aligned(path, arr, alignment=4096):
+    """Save an array in the .npy format with its data aligned on disk
+
+    The header is padded with spaces so that the raw array data starts on an
+    `alignment` byte boundary, which lets memory-mapped reads hit whole pages.
+    The data is written straight from the array buffer and object arrays are
+    rejected since they would need pickle. An existing file is replaced, not
+    overwritten in place, so `arr` may be memory-mapped from `path` itself.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to write, including the .npy extension
+    arr : Numpy Array
+        Array to save
+    alignment : int
+        Byte boundary the array data is aligned on (default: 4096)
     """
-    df_copy = df.copy()
-    target = df_copy.pop(target_col)
-    return df_copy, target
+    arr = np.ascontiguousarray(arr)
+    if arr.dtype.hasobject:
+        raise ValueError("Object arrays cannot be saved without pickle, convert them to a numeric dtype first")
 
-def save_sets(X_train=None, y_train=None, X_val=None, y_val=None, X_test=None, y_test=None, path='../data/processed/'):
+    header = repr(np.lib.format.header_data_from_array_1_0(arr)).encode('latin1')
+    magic = np.lib.format.magic(1, 0)
+    preamble_len = len(magic) + 2 + len(header) + 1
+    header += b' ' * (-preamble_len % alignment) + b'\n'
+
+    def write(f):
+        f.write(magic)
+        f.write(struct.pack('<H', len(header)))
+        f.write(header)
+        f.write(arr.reshape(-1).view(np.uint8).data)
+
+    _replace_file(path, write)
+
+def save_sets(X_train=None, y_train=None, X_val=None, y_val=None, X_test=None, y_test=None, path='../data/processed/', bundle=False, dtype=None, chunk_rows=None):
     """Save the different sets locally
 
     Parameters
@@ -38,31 +154,167 @@ def save_sets(X_train=None, y_train=None, X_val=None, y_val=None, X_test=None, y
     y_test: Numpy Array
         Target for the testing set
     path : str
-        Path to the folder where the sets will be saved (default: '../data/processed/')
+        Path to the folder where the sets will be saved, or prefix prepended to their file names (default: '../data/processed/')
+    bundle : bool
+        Whether to save all sets in a single uncompressed 'sets.npz' file instead of one .npy file per set (default: False)
+    dtype : data-type
+        Data type the features are converted to before saving, e.g. np.float32 to halve their size. Targets are kept as is (default: None)
+    chunk_rows : int
+        If set, each set is split along its rows into files of at most `chunk_rows` rows named 'X_train.000.npy', 'X_train.001.npy', ... (default: None)
+
+    Notes
+    -----
+    The files are written concurrently from a thread pool. Files from a previous
+    save of the same sets under `path`, single or chunked, are removed.
+    scikit-learn estimators accept float32 features, so they can be loaded back without conversion.
+    """
+    if bundle and chunk_rows is not None:
+        raise ValueError("chunk_rows cannot be used with bundle=True")
+    if chunk_rows is not None and (isinstance(chunk_rows, bool) or not isinstance(chunk_rows, (int, np.integer)) or chunk_rows <= 0):
+        raise ValueError(f"chunk_rows must be a positive integer, got {chunk_rows!r}")
+
+    sets = {'X_train': X_train, 'y_train': y_train, 'X_val': X_val, 'y_val': y_val, 'X_test': X_test, 'y_test': y_test}
+    pairs = [(name, arr) for name, arr in sets.items() if arr is not None]
+    if not pairs:
+        return
+
+    def convert(name, arr):
+        return np.ascontiguousarray(arr, dtype=dtype) if dtype is not None and name.startswith('X_') else arr
+
+    if bundle:
+        arrays = {name: convert(name, arr) for name, arr in pairs}
+        _replace_file(f'{path}sets.npz', lambda f: np.savez(f, allow_pickle=False, **arrays))
+        return
+
+    # Split the sets into (file name, set name, rows) tasks, chunks are only converted when written
+    files = []
+    for name, arr in pairs:
+        if chunk_rows is None:
+            files.append((f'{name}.npy', name, arr))
+            continue
+        rows = arr.iloc if hasattr(arr, 'iloc') else arr
+        n_chunks = max(1, -(-len(arr) // chunk_rows))
+        files.extend((f'{name}.{i:03d}.npy', name, rows[i * chunk_rows:(i + 1) * chunk_rows]) for i in range(n_chunks))
+
+    with ThreadPoolExecutor(max_workers=min(len(files), 32)) as executor:
+        list(executor.map(lambda file: numpy_save_aligned(f'{path}{file[0]}', convert(file[1], file[2])), files))
+
+    # Remove files left by a previous save of the same sets, such as extra chunks,
+    # so they are not mixed with the new data when loading
+    saved_names = {name for name, _ in pairs}
+    written = {file_name for file_name, _, _ in files}
+    for file_name in _list_files(path) - written:
+        match = re.fullmatch(r'(\w+)(\.\d+)?\.npy', file_name)
+        if match and match.group(1) in saved_names:
+            os.remove(f'{path}{file_name}')
+
+def _load_npz_member(file_path, info):
+    """Memory-map a single array stored uncompressed inside a .npz file
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .npz file
+    info : zipfile.ZipInfo
+        Zip entry of the array
+
+    Returns
+    -------
+    Numpy Array
+        Read-only memory-mapped array
+    """
+    with open(file_path, 'rb') as f:
+        # The local file header has its own name and extra field lengths,
+        # which may differ from the ones in the central directory
+        f.seek(info.header_offset + 26)
+        name_len, extra_len = struct.unpack('<HH', f.read(4))
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        raise ValueError("Object arrays cannot be loaded without pickle")
+    if np.prod(shape) == 0:
+        return np.empty(shape, dtype=dtype)
+
+    order = 'F' if fortran_order else 'C'
+    return np.memmap(file_path, dtype=dtype, shape=shape, order=order, mode='r', offset=offset)
+
+def _load_bundle(file_path):
+    """Load every array of a .npz file, memory-mapping the uncompressed ones
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the .npz file
+
+    Returns
+    -------
+    dict
+        Arrays keyed by their name in the archive
+    """
+    arrays = {}
+    with zipfile.ZipFile(file_path) as zf:
+        for info in zf.infolist():
+            name = info.filename.removesuffix('.npy')
+            if info.compress_type == zipfile.ZIP_STORED:
+                arrays[name] = _load_npz_member(file_path, info)
+            else:
+                with zf.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+    return arrays
+
+def _prefetch_file(file_path):
+    """Ask the OS to read a whole file into the page cache in one sequential pass
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to prefetch
+    """
+    with open(file_path, 'rb') as f:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        else:
+            while f.read(1 << 20):
+                pass
+
+def _list_files(path):
+    """List the names of the files saved under a path prefix
+
+    Parameters
+    ----------
+    path : str
+        Folder ending with a separator, or prefix of the file names, as given to `save_sets`
 
+    Returns
+    -------
+    set
+        File names with the prefix removed, empty if the folder does not exist
     """
-    import numpy as np
-
-    if X_train is not None:
-      np.save(f'{path}X_train', X_train)
-    if X_val is not None:
-      np.save(f'{path}X_val',   X_val)
-    if X_test is not None:
-      np.save(f'{path}X_test',  X_test)
-    if y_train is not None:
-      np.save(f'{path}y_train', y_train)
-    if y_val is not None:
-      np.save(f'{path}y_val',   y_val)
-    if y_test is not None:
-      np.save(f'{path}y_test',  y_test)
-
-def load_sets(path='../data/processed/'):
-    """Load the different locally save sets
+    folder, prefix = os.path.split(path)
+    try:
+        return {file_name[len(prefix):] for file_name in os.listdir(folder or '.') if file_name.startswith(prefix)}
+    except FileNotFoundError:
+        return set()
+
+def load_sets(path='../data/processed/', bundle=False, prefetch=False, concatenate=True):
+    """Load the different locally save sets as read-only memory-mapped arrays
 
     Parameters
     ----------
     path : str
-        Path to the folder where the sets are saved (default: '../data/processed/')
+        Path to the folder where the sets are saved, or prefix of their file names as given to `save_sets` (default: '../data/processed/')
+    bundle : bool
+        Whether to load the sets from a single 'sets.npz' file written with `save_sets(..., bundle=True)` (default: False)
+    prefetch : bool
+        Whether to read the files into the page cache upfront so later random access to the arrays does not hit the disk (default: False)
+    concatenate : bool
+        Whether sets saved in chunks with `save_sets(..., chunk_rows=...)` are concatenated into a single array in memory,
+        otherwise they are returned as lists of memory-mapped chunks to process one at a time (default: True)
 
     Returns
     -------
@@ -78,18 +330,52 @@ def load_sets(path='../data/processed/'):
         Features for the testing set
     Numpy Array
         Target for the testing set
-    """
-    import numpy as np
-    import os.path
-
-    X_train = np.load(f'{path}X_train.npy', allow_pickle=True) if os.path.isfile(f'{path}X_train.npy') else None
-    X_val   = np.load(f'{path}X_val.npy'  , allow_pickle=True) if os.path.isfile(f'{path}X_val.npy')   else None
-    X_test  = np.load(f'{path}X_test.npy' , allow_pickle=True) if os.path.isfile(f'{path}X_test.npy')  else None
-    y_train = np.load(f'{path}y_train.npy', allow_pickle=True) if os.path.isfile(f'{path}y_train.npy') else None
-    y_val   = np.load(f'{path}y_val.npy'  , allow_pickle=True) if os.path.isfile(f'{path}y_val.npy')   else None
-    y_test  = np.load(f'{path}y_test.npy' , allow_pickle=True) if os.path.isfile(f'{path}y_test.npy')  else None
 
-    return X_train, y_train, X_val, y_val, X_test, y_test
+    Notes
+    -----
+    The arrays are memory-mapped in read-only mode, so data is only read from
+    disk when it is accessed. Call `.copy()` on an array before modifying it.
+    Compressed members of a bundle cannot be memory-mapped and are read eagerly.
+    A set saved as a single file takes precedence over chunks of the same set.
+    A set whose file is missing, including when the folder itself does not
+    exist, is returned as None without raising an error.
+    """
+    # List the folder once instead of checking every file with a separate stat call
+    names = ('X_train', 'y_train', 'X_val', 'y_val', 'X_test', 'y_test')
+    existing = _list_files(path)
+
+    if bundle:
+        if 'sets.npz' not in existing:
+            return (None,) * len(names)
+        file_path = f'{path}sets.npz'
+        if prefetch:
+            _prefetch_file(file_path)
+        sets = _load_bundle(file_path)
+        return tuple(sets.get(name) for name in names)
+
+    chunks = {}
+    for file_name in existing:
+        match = re.fullmatch(r'(\w+)\.(\d+)\.npy', file_name)
+        if match and match.group(1) in names:
+            chunks.setdefault(match.group(1), []).append((int(match.group(2)), file_name))
+
+    def load(file_name):
+        file_path = f'{path}{file_name}'
+        if prefetch:
+            _prefetch_file(file_path)
+        return np.load(file_path, mmap_mode='r', allow_pickle=False)
+
+    sets = []
+    for name in names:
+        if f'{name}.npy' in existing:
+            sets.append(load(f'{name}.npy'))
+        elif name in chunks:
+            arrays = [load(file_name) for _, file_name in sorted(chunks[name])]
+            sets.append(np.concatenate(arrays) if concatenate else arrays)
+        else:
+            sets.append(None)
+
+    return tuple(sets)
 
 def subset_x_y(target, features, start_index:int, end_index:int):
     """Keep only the rows for X and y (optional) sets from the specified indexes
@@ -100,21 +386,61 @@ def subset_x_y(target, features, start_index:int, end_index:int):
         Dataframe containing the target
     features : pd.DataFrame
         Dataframe containing all features
-    features : int
+    start_index : int
         Index of the starting observation
-    features : int
+    end_index : int
         Index of the ending observation
 
     Returns
     -------
-    pd.DataFrame
-        Subsetted Pandas dataframe containing the target
     pd.DataFrame
         Subsetted Pandas dataframe containing all features
+    pd.DataFrame
+        Subsetted Pandas dataframe containing the target
+
+    Notes
+    -----
+    The subsets are views on the inputs, no data is copied. Writing to them
+    may copy or modify the inputs, use `subset_x_y_into` to fill reusable
+    buffers instead.
     """
 
     return features[start_index:end_index], target[start_index:end_index]
 
+def subset_x_y_into(out_x, out_y, target, features, start_index:int, end_index:int):
+    """Copy the rows for X and y sets from the specified indexes into preallocated arrays
+
+    Useful when the same window size is extracted repeatedly, e.g. for rolling
+    evaluation, as no new arrays are allocated.
+
+    Parameters
+    ----------
+    out_x : Numpy Array
+        Array receiving the features, with as many rows as the subset
+    out_y : Numpy Array
+        Array receiving the target, with as many rows as the subset
+    target : pd.DataFrame or Numpy Array
+        Target
+    features : pd.DataFrame or Numpy Array
+        All features
+    start_index : int
+        Index of the starting observation
+    end_index : int
+        Index of the ending observation
+
+    Returns
+    -------
+    Numpy Array
+        out_x filled with the subsetted features
+    Numpy Array
+        out_y filled with the subsetted target
+    """
+    X, y = subset_x_y(target=target, features=features, start_index=start_index, end_index=end_index)
+    np.copyto(out_x, np.asarray(X))
+    np.copyto(out_y, np.asarray(y))
+
+    return out_x, out_y
+
 def split_sets_by_time(df, target_col, test_ratio=0.2):
     """Split sets by indexes for an ordered dataframe
 
@@ -141,21 +467,116 @@ def split_sets_by_time(df, target_col, test_ratio=0.2):
         Features for the testing set
     Numpy Array
         Target for the testing set
+
+    Notes
+    -----
+    The features and target are separated with `pop_target` and the sets are
+    slices of them. Memory use is therefore that of `pop_target`: without pandas
+    copy-on-write the feature columns are copied once, as with `df.copy()`.
+    """
+
+    features, target = pop_target(df, target_col)
+    cutoff = int(len(features) * test_ratio)
+
+    X_train, y_train = subset_x_y(target=target, features=features, start_index=0, end_index=-cutoff*2)
+    X_val, y_val     = subset_x_y(target=target, features=features, start_index=-cutoff*2, end_index=-cutoff)
+    X_test, y_test   = subset_x_y(target=target, features=features, start_index=-cutoff, end_index=len(features))
+
+    return X_train, y_train, X_val, y_val, X_test, y_test
+
+def _impute_columns(df, num_columns, cat_columns, num_impute_strategy, cat_impute_strategy):
+    """Impute numerical and categorical columns in place
+
+    Numerical columns imputed with 'mean' or 'median' are filled directly on their
+    NumPy block and categorical columns imputed with 'most_frequent' with pandas
+    `mode` and `fillna`. The other columns are imputed with a single ColumnTransformer fit.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        The dataframe to impute.
+    num_columns: list
+        List of numerical columns to impute.
+    cat_columns: list
+        List of categorical columns to impute.
+    num_impute_strategy: str
+        Strategy to impute numerical columns.
+    cat_impute_strategy: str
+        Strategy to impute categorical columns.
+    """
+    num_columns, cat_columns = list(num_columns), list(cat_columns)
+    transformers = []
+
+    if num_columns and num_impute_strategy in ('mean', 'median'):
+        values = df[num_columns].to_numpy(dtype=np.float64)
+        if not values.flags.writeable:
+            # Under copy-on-write pandas hands out read-only views of its blocks
+            values = values.copy()
+        fill_values = np.nanmean(values, axis=0) if num_impute_strategy == 'mean' else np.nanmedian(values, axis=0)
+        np.copyto(values, fill_values, where=np.isnan(values))
+        df[num_columns] = values
+    elif num_columns:
+        transformers.append(("num", SimpleImputer(strategy=num_impute_strategy), num_columns))
+
+    if cat_columns and cat_impute_strategy == 'most_frequent':
+        # DataFrame.mode sorts tied values, so the smallest one is used like SimpleImputer does
+        modes = df[cat_columns].mode(dropna=True).iloc[0]
+        df[cat_columns] = df[cat_columns].fillna(modes)
+    elif cat_columns:
+        transformers.append(("cat", SimpleImputer(strategy=cat_impute_strategy), cat_columns))
+
+    if not transformers:
+        return
+
+    imputer = ColumnTransformer(
+        transformers, remainder="drop", verbose_feature_names_out=False,
+    ).set_output(transform="pandas")
+    imputed = imputer.fit_transform(df)
+
+    df[imputed.columns] = imputed
+
+def _apply_transformation(series, func, vectorized=False):
+    """Apply a transformation function to the non-missing values of a series
+
+    NumPy ufuncs, `np.vectorize` objects and functions flagged as vectorized are
+    called once on the array of non-missing values. Any other function is applied
+    element by element.
+
+    Parameters
+    ----------
+    series: pd.Series
+        Series to transform.
+    func: callable
+        Transformation function.
+    vectorized: bool
+        Whether `func` takes the whole array of values and returns an array of the same shape.
+
+    Returns
+    -------
+    pd.Series
+        Transformed series, with NaN where the input was missing.
     """
+    mask = series.notna().to_numpy()
+    values = series.to_numpy()[mask]
 
-    df_copy = df.copy()
-    target = df_copy.pop(target_col)
-    cutoff = int(len(df_copy) / 5)
+    if vectorized or isinstance(func, (np.ufunc, np.vectorize)):
+        transformed = np.asarray(func(values))
+        if transformed.shape != values.shape:
+            raise ValueError(f"Vectorized transformation of column {series.name!r} returned shape {transformed.shape}, expected {values.shape}")
+    else:
+        transformed = np.vectorize(func, otypes=[object])(values)
 
-    X_train, y_train = subset_x_y(target=target, features=df_copy, start_index=0, end_index=-cutoff*2)
-    X_val, y_val     = subset_x_y(target=target, features=df_copy, start_index=-cutoff*2, end_index=-cutoff)
-    X_test, y_test   = subset_x_y(target=target, features=df_copy, start_index=-cutoff, end_index=len(df_copy))
+    if mask.all():
+        result = transformed
+    else:
+        result = np.full(len(series), np.nan, dtype=object)
+        result[mask] = transformed
 
-    return X_train, y_train, X_val, y_val, X_test, 
+    return pd.Series(result, index=series.index, name=series.name).infer_objects()
 
 def data_cleaning(df, num_columns=None, cat_columns=None, 
                               num_impute_strategy='mean', cat_impute_strategy='most_frequent', 
-                              special_column_transformations=None):
+                              special_column_transformations=None, vectorized_columns=None):
     """
     Generalized function to clean data, handle missing values, and standardize specific columns.
 
@@ -173,44 +594,87 @@ def data_cleaning(df, num_columns=None, cat_columns=None,
         Strategy to impute categorical columns. Default is 'most_frequent'.
     special_column_transformations: dict
         Dictionary where key is column name and value is the transformation function.
+        Functions are applied element by element, except NumPy ufuncs, `np.vectorize`
+        objects and the functions of `vectorized_columns`, which are called once on the
+        array of values. Missing values are left as NaN and never passed to the function.
+    vectorized_columns: list
+        Columns of special_column_transformations whose function takes the whole array of
+        values and returns an array of the same shape, e.g. Numba-compiled functions.
 
     Returns
     -------
     pd.DataFrame
-        Cleaned dataframe.
+        Cleaned dataframe. The input dataframe is not modified.
     """
-    import pandas as pd
-    import numpy as np
-    from sklearn.impute import SimpleImputer
-
-    # Handling missing values for numerical columns
-    if num_columns is None:
-        num_columns = df.select_dtypes(include=['float64', 'int64']).columns
-    
-    numerical_imputer = SimpleImputer(strategy=num_impute_strategy)
-    df[num_columns] = numerical_imputer.fit_transform(df[num_columns])
-    
-    # Handling missing values for categorical columns
-    if cat_columns is None:
-        cat_columns = df.select_dtypes(include=['object']).columns
-    
-    categorical_imputer = SimpleImputer(strategy=cat_impute_strategy)
-    df[cat_columns] = categorical_imputer.fit_transform(df[cat_columns])
+    # Work on a shallow copy: columns are replaced rather than written in place,
+    # so the caller's dataframe is left untouched without copying its data upfront
+    df = df.copy(deep=False)
+
+    # Handling missing values for numerical and categorical columns in a single pass,
+    # looking up the column dtypes only once when columns are not provided
+    if num_columns is None or cat_columns is None:
+        dtypes = df.dtypes
+        if num_columns is None:
+            num_columns = [col for col, dtype in dtypes.items() if dtype in ('float64', 'int64')]
+        if cat_columns is None:
+            cat_columns = [col for col, dtype in dtypes.items() if dtype == 'object']
+
+    _impute_columns(df, num_columns, cat_columns, num_impute_strategy, cat_impute_strategy)
     
     # Applying any special transformations passed in the special_column_transformations dictionary
     if special_column_transformations:
+        vectorized_columns = set(vectorized_columns or [])
         for col, func in special_column_transformations.items():
-            df[col] = df[col].apply(lambda x: func(x) if pd.notna(x) else np.nan)
+            df[col] = _apply_transformation(df[col], func, vectorized=col in vectorized_columns)
 
-    # Final fallback for any remaining missing values
-    remaining_num_columns = df.select_dtypes(include=['float64', 'int64']).columns
-    remaining_cat_columns = df.select_dtypes(include=['object']).columns
-    
-    df[remaining_num_columns] = numerical_imputer.fit_transform(df[remaining_num_columns])
-    df[remaining_cat_columns] = categorical_imputer.fit_transform(df[remaining_cat_columns])
+        # Impute again only the transformed columns that still contain missing values
+        affected_columns = [col for col in special_column_transformations if df[col].isna().any()]
+        affected_num_columns = [col for col in affected_columns if pd.api.types.is_numeric_dtype(df[col])]
+        affected_cat_columns = [col for col in affected_columns if pd.api.types.is_object_dtype(df[col])]
+        _impute_columns(df, affected_num_columns, affected_cat_columns, num_impute_strategy, cat_impute_strategy)
     
     return df
 
+@functools.lru_cache(maxsize=16)
+def _dark2_palette(n_colors):
+    """Build the 'Dark2' seaborn palette once per number of colors
+
+    Parameters
+    ----------
+    n_colors : int
+        Number of colors in the palette
+
+    Returns
+    -------
+    tuple
+        RGB colors of the palette
+    """
+    sns, _ = _load_plotting()
+    return tuple(sns.color_palette('Dark2', n_colors))
+
+def _value_counts(series):
+    """Count the occurrences of each value, sorted by descending count
+
+    Categorical series are counted with a bincount over their codes instead of
+    building a hash table.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Series to count
+
+    Returns
+    -------
+    pd.Series
+        Counts indexed by value
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.value_counts()
+
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    return pd.Series(counts, index=series.cat.categories, name='count').sort_values(ascending=False, kind='stable')
+
 def distribution_plot(df, x, kind="hist", kde=False):
     """
     Function to generate distribution plots: histogram, KDE, boxplot, violinplot.
@@ -229,8 +693,7 @@ def distribution_plot(df, x, kind="hist", kde=False):
         Grouping variable that will produce different colors in the plot.
     
     """
-    import seaborn as sns
-    import matplotlib.pyplot as plt
+    sns, plt = _load_plotting()
 
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -251,9 +714,9 @@ def distribution_plot(df, x, kind="hist", kde=False):
         ax.set_title(f'Violin Plot of {x}')
     
     elif kind == "piechart":
-        distribution_count = df[x].value_counts()
+        distribution_count = _value_counts(df[x])
         ax.pie(distribution_count, labels=distribution_count.index, autopct='%1.1f%%', startangle=140, 
-                colors=sns.color_palette('Dark2', len(distribution_count)))
+                colors=_dark2_palette(len(distribution_count)))
         ax.set_title(f'Pie Chart of {x}')
     
     elif kind == "countplot":
@@ -281,8 +744,7 @@ def categorical_plot(df, x, y=None, kind="barplot", hue=None):
     hue : str, optional
         Grouping variable that will produce different colors in the plot.
     """
-    import seaborn as sns
-    import matplotlib.pyplot as plt
+    sns, plt = _load_plotting()
 
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -323,8 +785,7 @@ def relationship_plot(df, x, y, kind="scatterplot", hue=None):
     hue : str, optional
         Grouping variable that will produce different colors in the plot.
     """
-    import seaborn as sns
-    import matplotlib.pyplot as plt
+    sns, plt = _load_plotting()
 
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -346,12 +807,23 @@ def relationship_plot(df, x, y, kind="scatterplot", hue=None):
 
 
 def roc_curve_plot(y, y_preds):
-    import matplotlib.pyplot as plt
-    from sklearn.metrics import roc_curve, roc_auc_score
+    """
+    Function to plot the ROC curve and its area under the curve.
 
-    roc_auc = roc_auc_score(y, y_preds)
+    Parameters
+    ----------
+    y : array-like of shape (n_samples,)
+        True binary labels.
+    y_preds : array-like of shape (n_samples,)
+        Predicted scores or probabilities for the positive class.
 
+    """
+    _, plt = _load_plotting()
+
+    # The area is integrated from the computed curve to avoid sorting the scores twice
     fpr, tpr, thresholds = roc_curve(y, y_preds)
+    roc_auc = auc(fpr, tpr)
+
     plt.figure(figsize=(8, 6))
     plt.plot(fpr, tpr, color='blue', label=f'ROC Curve (area = {roc_auc:.4f})')
     plt.plot([0, 1], [0, 1], color='red', linestyle='--')
@@ -360,6 +832,44 @@ def roc_curve_plot(y, y_preds):
     plt.title('Receiver Operating Characteristic (ROC) Curve')
     plt.legend(loc="lower right")
 
+def _confusion_matrix(y_true, y_pred):
+    """Compute the confusion matrix with a single bincount over packed label pairs
+
+    Each (true, predicted) pair is encoded as `true * K + predicted` where K is the
+    number of distinct labels, so all cells are counted in one pass.
+
+    Parameters
+    ----------
+    y_true : array-like of shape (n_samples,)
+        True labels.
+    y_pred : array-like of shape (n_samples,)
+        Predicted labels.
+
+    Returns
+    -------
+    Numpy Array
+        Confusion matrix of shape (K, K), rows are true labels and columns predicted labels
+    Numpy Array
+        Sorted labels matching the rows and columns
+    """
+    y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+    if len(y_true) != len(y_pred):
+        raise ValueError(f"y_true and y_pred have different lengths: {len(y_true)} and {len(y_pred)}")
+
+    y_all = np.concatenate([y_true, y_pred])
+    if y_all.dtype.kind in 'iu' and len(y_all) and 0 <= y_all.min() and y_all.max() < 2 ** 16:
+        # Small non-negative integer labels are encoded with a lookup table instead of a sort
+        present = np.bincount(y_all) > 0
+        labels = np.flatnonzero(present)
+        encoded = (np.cumsum(present) - 1)[y_all]
+    else:
+        labels, encoded = np.unique(y_all, return_inverse=True)
+    n_labels = len(labels)
+    pairs = encoded[:len(y_true)] * n_labels + encoded[len(y_true):]
+    cm = np.bincount(pairs, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+    return cm, labels
+
 def confusion_matrix_plot(y_true, y_pred, cmap="Blues"):
     """
     Function to plot confusion matrix using Seaborn and Matplotlib.
@@ -375,16 +885,14 @@ def confusion_matrix_plot(y_true, y_pred, cmap="Blues"):
     
     """
 
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    from sklearn.metrics import confusion_matrix
+    sns, plt = _load_plotting()
 
     # Compute the confusion matrix
-    cm = confusion_matrix(y_true, y_pred)
+    cm, labels = _confusion_matrix(y_true, y_pred)
     
     # Create a heatmap
     plt.figure(figsize=(6, 4))
-    sns.heatmap(cm, annot=True, fmt="d", cmap=cmap)
+    sns.heatmap(cm, annot=True, fmt="d", cmap=cmap, xticklabels=labels, yticklabels=labels)
     plt.xlabel('Predicted Labels')
     plt.ylabel('True Labels')
     plt.title('Confusion Matrix')
\ No newline at end of file
@@ -1,8 +1,12 @@
 # Solution
+import os
+import stat
+
 import pytest
 import pandas as pd
+import numpy as np
 
-from grp_krml_group6.data.sets import pop_target
+from grp_krml_group6.data.sets import pop_target, numpy_save_aligned, save_sets, load_sets, data_cleaning, split_sets_by_time, subset_x_y_into, _confusion_matrix, _value_counts
 
 @pytest.fixture
 def features_fixture():
@@ -43,4 +47,311 @@ def test_pop_target_df_none(features_fixture, target_fixture):
     input_df = features_fixture.copy()
 
     with pytest.raises(AttributeError):
-        features, target = pop_target(df=None, target_col="salary")
\ No newline at end of file
+        features, target = pop_target(df=None, target_col="salary")
+
+def test_pop_target_leaves_input_untouched(features_fixture, target_fixture):
+    input_df = features_fixture.copy()
+    input_df["salary"] = target_fixture
+
+    features, target = pop_target(df=input_df, target_col='salary')
+
+    assert "salary" in input_df.columns
+    assert list(features.columns) == ["employee_id", "age", "level"]
+
+def test_pop_target_returns_independent_data(features_fixture, target_fixture):
+    input_df = features_fixture.copy()
+    input_df["salary"] = target_fixture
+
+    features, target = pop_target(df=input_df, target_col='salary')
+    target.iloc[0] = 99
+    features.iloc[0, 1] = 99
+
+    assert input_df.loc[0, "salary"] == 5
+    assert input_df.loc[0, "age"] == 25
+
+
+def test_numpy_save_aligned_data_offset(tmp_path):
+    arr = np.arange(12, dtype=np.float64).reshape(4, 3)
+    file_path = tmp_path / "arr.npy"
+
+    numpy_save_aligned(str(file_path), arr)
+
+    with open(file_path, "rb") as f:
+        np.lib.format.read_magic(f)
+        np.lib.format.read_array_header_1_0(f)
+        assert f.tell() % 4096 == 0
+    np.testing.assert_array_equal(np.load(file_path, allow_pickle=False), arr)
+
+def test_numpy_save_aligned_object_array(tmp_path):
+    arr = np.array(["a", None], dtype=object)
+
+    with pytest.raises(ValueError):
+        numpy_save_aligned(str(tmp_path / "arr.npy"), arr)
+
+def test_save_load_sets_roundtrip(tmp_path):
+    path = f"{tmp_path}/"
+    X_train = np.arange(6, dtype=np.float64).reshape(3, 2)
+    y_train = np.array([0, 1, 0])
+
+    save_sets(X_train=X_train, y_train=y_train, path=path)
+    loaded = load_sets(path=path)
+
+    np.testing.assert_array_equal(loaded[0], X_train)
+    np.testing.assert_array_equal(loaded[1], y_train)
+    assert loaded[2:] == (None, None, None, None)
+
+def test_load_sets_read_only(tmp_path):
+    path = f"{tmp_path}/"
+    save_sets(X_train=np.zeros((3, 2)), path=path)
+
+    X_train = load_sets(path=path)[0]
+
+    assert isinstance(X_train, np.memmap)
+    with pytest.raises(ValueError):
+        X_train[0, 0] = 1.0
+
+def test_save_sets_all_sets(tmp_path):
+    path = f"{tmp_path}/"
+    sets = [np.full((2, 2), i, dtype=np.float64) for i in range(6)]
+
+    save_sets(*sets, path=path)
+    loaded = load_sets(path=path)
+
+    for expected, actual in zip(sets, loaded):
+        np.testing.assert_array_equal(actual, expected)
+
+def test_save_load_sets_bundle(tmp_path):
+    path = f"{tmp_path}/"
+    X_train = np.arange(6, dtype=np.float64).reshape(3, 2)
+    y_test = np.array([1, 0, 1])
+
+    save_sets(X_train=X_train, y_test=y_test, path=path, bundle=True)
+    X_train_loaded, y_train, X_val, y_val, X_test, y_test_loaded = load_sets(path=path, bundle=True)
+
+    assert isinstance(X_train_loaded, np.memmap)
+    np.testing.assert_array_equal(X_train_loaded, X_train)
+    np.testing.assert_array_equal(y_test_loaded, y_test)
+    assert (y_train, X_val, y_val, X_test) == (None, None, None, None)
+
+@pytest.fixture
+def missing_fixture():
+    return pd.DataFrame({
+        "age": [20.0, np.nan, 30.0, 22.0],
+        "games": [10, 20, 30, 40],
+        "team": ["LAL", np.nan, "LAL", "BOS"],
+        "height": ["6-8", "7-0", np.nan, "6-5"],
+    }, index=[10, 11, 12, 13])
+
+def test_data_cleaning_imputes_missing(missing_fixture):
+    cleaned = data_cleaning(missing_fixture.copy())
+
+    assert not cleaned.isna().any().any()
+    assert cleaned.loc[11, "age"] == 24.0
+    assert cleaned.loc[11, "team"] == "LAL"
+    assert list(cleaned.index) == [10, 11, 12, 13]
+
+def test_data_cleaning_special_transformations(missing_fixture):
+    def height_to_inches(height):
+        feet, inches = height.split("-")
+        return float(feet) * 12 + float(inches)
+
+    cleaned = data_cleaning(missing_fixture.copy(), cat_columns=["team"],
+                            special_column_transformations={"height": height_to_inches})
+
+    assert cleaned["height"].tolist() == pytest.approx([80.0, 84.0, 241 / 3, 77.0])
+
+def test_data_cleaning_array_transformation(missing_fixture):
+    cleaned = data_cleaning(missing_fixture.copy(),
+                            special_column_transformations={"games": lambda x: x * 2, "age": np.sqrt, "team": len},
+                            vectorized_columns=["games"])
+
+    assert cleaned["games"].tolist() == [20, 40, 60, 80]
+    assert cleaned["age"].tolist() == pytest.approx(np.sqrt([20.0, 24.0, 30.0, 22.0]))
+    assert cleaned["team"].tolist() == [3, 3, 3, 3]
+
+def test_data_cleaning_scalar_transformation_not_vectorized(missing_fixture):
+    cleaned = data_cleaning(missing_fixture.copy(), special_column_transformations={"team": lambda s: s[::-1]})
+
+    assert cleaned["team"].tolist() == ["LAL", "LAL", "LAL", "SOB"]
+
+def test_data_cleaning_scalar_transformation_error(missing_fixture):
+    with pytest.raises(AttributeError):
+        data_cleaning(missing_fixture.copy(), special_column_transformations={"games": lambda x: x.upper()})
+
+def test_data_cleaning_vectorized_transformation_shape(missing_fixture):
+    with pytest.raises(ValueError):
+        data_cleaning(missing_fixture.copy(), special_column_transformations={"games": np.sum}, vectorized_columns=["games"])
+
+def test_split_sets_by_time():
+    input_df = pd.DataFrame({"feature": range(10), "target": range(100, 110)})
+
+    X_train, y_train, X_val, y_val, X_test, y_test = split_sets_by_time(input_df, target_col="target")
+
+    assert X_train["feature"].tolist() == [0, 1, 2, 3, 4, 5]
+    assert y_val.tolist() == [106, 107]
+    assert X_test["feature"].tolist() == [8, 9]
+    assert y_test.tolist() == [108, 109]
+    assert "target" in input_df.columns
+
+def test_load_sets_missing_folder(tmp_path):
+    assert load_sets(path=f"{tmp_path}/missing/") == (None, None, None, None, None, None)
+
+@pytest.mark.parametrize("bundle", [False, True])
+def test_load_sets_prefetch(tmp_path, bundle):
+    path = f"{tmp_path}/"
+    X_val = np.arange(6, dtype=np.float64).reshape(3, 2)
+    save_sets(X_val=X_val, path=path, bundle=bundle)
+
+    loaded = load_sets(path=path, bundle=bundle, prefetch=True)
+
+    np.testing.assert_array_equal(loaded[2], X_val)
+
+def test_data_cleaning_median_strategy(missing_fixture):
+    input_df = missing_fixture.copy()
+    input_df.loc[13, "age"] = 100.0
+
+    cleaned = data_cleaning(input_df, num_impute_strategy="median")
+
+    assert cleaned.loc[11, "age"] == 30.0
+
+@pytest.mark.parametrize("y_true, y_pred", [
+    ([0, 1, 1, 0, 1], [0, 1, 0, 0, 1]),
+    ([2, 0, 2, 5], [0, 0, 5, 5]),
+    (["cat", "dog", "dog"], ["dog", "dog", "bird"]),
+])
+def test_confusion_matrix_matches_sklearn(y_true, y_pred):
+    from sklearn.metrics import confusion_matrix
+
+    cm, labels = _confusion_matrix(y_true, y_pred)
+
+    np.testing.assert_array_equal(cm, confusion_matrix(y_true, y_pred))
+    np.testing.assert_array_equal(labels, sorted(set(y_true) | set(y_pred)))
+
+def test_data_cleaning_leaves_input_untouched(missing_fixture):
+    input_df = missing_fixture.copy()
+
+    data_cleaning(input_df, special_column_transformations={"games": lambda x: x * 2})
+
+    pd.testing.assert_frame_equal(input_df, missing_fixture)
+
+def test_value_counts_categorical():
+    series = pd.Series(["b", "a", "b", np.nan, "c", "b", "a"], dtype="category")
+    series = series.cat.add_categories(["d"])
+
+    counts = _value_counts(series)
+
+    assert counts.to_dict() == series.value_counts().to_dict()
+    assert counts.index.tolist() == ["b", "a", "c", "d"]
+
+def test_save_sets_dtype(tmp_path):
+    path = f"{tmp_path}/"
+
+    save_sets(X_train=np.ones((3, 2)), y_train=np.array([0, 1, 0]), path=path, dtype=np.float32)
+    X_train, y_train = load_sets(path=path)[:2]
+
+    assert X_train.dtype == np.float32
+    assert y_train.dtype == np.array([0, 1, 0]).dtype
+
+def test_subset_x_y_into():
+    features = pd.DataFrame({"a": range(6), "b": range(10, 16)})
+    target = pd.Series(range(100, 106))
+    out_x, out_y = np.empty((2, 2), dtype=np.int64), np.empty(2, dtype=np.int64)
+
+    X, y = subset_x_y_into(out_x, out_y, target=target, features=features, start_index=2, end_index=4)
+
+    assert X is out_x and y is out_y
+    np.testing.assert_array_equal(out_x, [[2, 12], [3, 13]])
+    np.testing.assert_array_equal(out_y, [102, 103])
+
+def test_data_cleaning_most_frequent_tie(missing_fixture):
+    input_df = missing_fixture.copy()
+    input_df.loc[12, "team"] = "BOS"
+
+    cleaned = data_cleaning(input_df)
+
+    assert cleaned.loc[11, "team"] == "BOS"
+
+def test_save_load_sets_chunks(tmp_path):
+    path = f"{tmp_path}/"
+    X_train = np.arange(20, dtype=np.float64).reshape(10, 2)
+    y_train = pd.Series(range(10))
+
+    save_sets(X_train=X_train, y_train=y_train, path=path, chunk_rows=4, dtype=np.float32)
+    X_train_loaded, y_train_loaded = load_sets(path=path)[:2]
+    X_train_chunks = load_sets(path=path, concatenate=False)[0]
+
+    assert sorted(p.name for p in tmp_path.iterdir())[:3] == ["X_train.000.npy", "X_train.001.npy", "X_train.002.npy"]
+    np.testing.assert_array_equal(X_train_loaded, X_train.astype(np.float32))
+    np.testing.assert_array_equal(y_train_loaded, y_train.to_numpy())
+    assert [len(chunk) for chunk in X_train_chunks] == [4, 4, 2]
+
+def test_save_sets_chunks_with_bundle(tmp_path):
+    with pytest.raises(ValueError):
+        save_sets(X_train=np.ones((3, 2)), path=f"{tmp_path}/", bundle=True, chunk_rows=2)
+
+def test_save_sets_loaded_sets_roundtrip(tmp_path):
+    path = f"{tmp_path}/"
+    X_train = np.arange(2048, dtype=np.float64).reshape(1024, 2)
+    y_train = np.arange(1024)
+    save_sets(X_train=X_train, y_train=y_train, path=path)
+
+    save_sets(*load_sets(path=path), path=path)
+    loaded = load_sets(path=path)
+
+    np.testing.assert_array_equal(loaded[0], X_train)
+    np.testing.assert_array_equal(loaded[1], y_train)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["X_train.npy", "y_train.npy"]
+
+def test_save_sets_loaded_bundle_roundtrip(tmp_path):
+    path = f"{tmp_path}/"
+    X_train = np.arange(2048, dtype=np.float64).reshape(1024, 2)
+    save_sets(X_train=X_train, path=path, bundle=True)
+
+    save_sets(*load_sets(path=path, bundle=True), path=path, bundle=True)
+
+    np.testing.assert_array_equal(load_sets(path=path, bundle=True)[0], X_train)
+
+@pytest.mark.parametrize("bundle", [False, True])
+def test_save_load_sets_path_prefix(tmp_path, bundle):
+    path = f"{tmp_path}/run1_"
+    X_train = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+    save_sets(X_train=X_train, path=path, bundle=bundle)
+
+    np.testing.assert_array_equal(load_sets(path=path, bundle=bundle)[0], X_train)
+    assert load_sets(path=f"{tmp_path}/run2_", bundle=bundle)[0] is None
+
+def test_save_sets_chunks_replace_previous_save(tmp_path):
+    path = f"{tmp_path}/"
+
+    save_sets(X_train=np.arange(10), path=path, chunk_rows=4)
+    save_sets(X_train=np.arange(100, 108), y_train=np.arange(3), path=path, chunk_rows=4)
+    np.testing.assert_array_equal(load_sets(path=path)[0], np.arange(100, 108))
+
+    save_sets(X_train=np.arange(2), path=path)
+    np.testing.assert_array_equal(load_sets(path=path)[0], np.arange(2))
+
+    save_sets(X_train=np.arange(6), path=path, chunk_rows=4)
+    np.testing.assert_array_equal(load_sets(path=path)[0], np.arange(6))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["X_train.000.npy", "X_train.001.npy", "y_train.000.npy"]
+
+@pytest.mark.parametrize("chunk_rows", [0, -1, 2.5, True])
+def test_save_sets_invalid_chunk_rows(tmp_path, chunk_rows):
+    with pytest.raises(ValueError):
+        save_sets(X_train=np.ones((3, 2)), path=f"{tmp_path}/", chunk_rows=chunk_rows)
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+@pytest.mark.parametrize("bundle, file_name", [(False, "X_train.npy"), (True, "sets.npz")])
+def test_save_sets_file_mode(tmp_path, bundle, file_name):
+    path = f"{tmp_path}/"
+    old_umask = os.umask(0o022)
+    try:
+        save_sets(X_train=np.ones((3, 2)), path=path, bundle=bundle)
+    finally:
+        os.umask(old_umask)
+    file_path = tmp_path / file_name
+    assert stat.S_IMODE(file_path.stat().st_mode) == 0o644
+
+    file_path.chmod(0o640)
+    save_sets(X_train=np.zeros((3, 2)), path=path, bundle=bundle)
+    assert stat.S_IMODE(file_path.stat().st_mode) == 0o640